@@ -1,4 +1,4 @@
-from functools import cache
+from functools import lru_cache
 
 import pandas as pd
 import pooch
@@ -7,8 +7,9 @@ import xarray as xr
 import mesmer
 
 
-# use an inner function as @cache does not preserve the signature
-@cache
+# use an inner function as @lru_cache does not preserve the signature
+# NOTE: bound the cache so that varying `version` does not accumulate data
+@lru_cache(maxsize=4)
 def _load_aod_obs(*, version, resample):
 
     if version != "2022":
@@ -244,6 +244,10 @@ def _assert_required_dims(
 
     __tracebackhide__ = True
 
+    # NOTE: return early - avoid creating the sets if nothing is required
+    if required_dims is None:
+        return
+
     required_dims = _to_set(required_dims)
 
     if required_dims - set(obj.dims):
@@ -257,6 +261,9 @@ def _assert_required_coords(
 
     __tracebackhide__ = True
 
+    if required_coords is None:
+        return
+
     required_coords = _to_set(required_coords)
 
     if required_coords - set(obj.coords):
@@ -1,7 +1,9 @@
 import functools
-from collections.abc import Callable
+import math
+from collections.abc import Callable, Hashable
 from typing import ParamSpec, TypeVar, overload
 
+import numpy as np
 import pandas as pd
 import xarray as xr
 from packaging.version import Version
@@ -122,18 +124,152 @@ def collapse_datatree_into_dataset(
         The collapsed dataset.
     """
     # TODO: could potentially be replaced by DataTree.merge_child_nodes in the future?
-    datasets = [subtree.to_dataset() for subtree in dt.subtree if not subtree.is_empty]
+
+    # gather the names and datasets of all non-empty nodes in a single traversal
+    dims, datasets = [], []
+    for subtree in dt.subtree:
+        if not subtree.is_empty:
+            dims.append(subtree.name)
+            datasets.append(subtree.to_dataset())
 
     join = concat_kwargs.pop("join", "outer")
 
+    if join == "outer" and not concat_kwargs:
+        ds = _concat_outer_prealigned(datasets, dim=dim, names=dims)
+        if ds is not None:
+            return ds
+
     # Concatenate datasets along the specified dimension
     ds = xr.concat(datasets, dim=dim, join=join, **concat_kwargs)
-    dims = [subtree.name for subtree in dt.subtree if not subtree.is_empty]
     ds = ds.assign_coords({dim: dims})
 
     return ds
 
 
+def _concat_outer_prealigned(
+    datasets: list[xr.Dataset], *, dim: str, names: list
+) -> xr.Dataset | None:
+    """concatenate datasets along a new dimension using an outer join
+
+    Equivalent to ``xr.concat(datasets, dim=dim, join="outer")`` but the data of each
+    dataset is directly written into a pre-allocated, NaN-filled array instead of
+    reindexing the datasets and concatenating them afterwards (i.e., copying the data
+    once instead of twice). As for ``xr.concat``, the attrs and encoding are taken from
+    the first dataset. Returns None if the datasets are not supported (e.g., non-float
+    or non-numpy data, differing non-index coords), then ``xr.concat`` must be used.
+    """
+
+    if not datasets:
+        return None
+
+    first = datasets[0]
+    var_dims = {name: da.dims for name, da in first.data_vars.items()}
+    indexed_dims = set(first.xindexes)
+    non_index_coords = set(first.coords) - indexed_dims
+
+    for ds in datasets:
+        if (
+            dim in ds.dims
+            or set(ds.coords) != set(first.coords)
+            or set(ds.xindexes) != indexed_dims
+            or not indexed_dims <= set(ds.dims)
+            or {name: da.dims for name, da in ds.data_vars.items()} != var_dims
+        ):
+            return None
+
+        # non-index coords (e.g. lat & lon of a 1D grid) must be equal and cannot be
+        # aligned - then xr.concat does not concatenate them
+        for name in non_index_coords:
+            coord = ds[name].variable
+            if indexed_dims & set(coord.dims) or not coord.equals(first[name].variable):
+                return None
+
+        # dimensions without index are not aligned - they must have the same size
+        if any(ds.sizes[d] != first.sizes[d] for d in ds.dims if d not in indexed_dims):
+            return None
+
+        for da in ds.data_vars.values():
+            if not isinstance(da.data, np.ndarray) or da.dtype.kind != "f":
+                return None
+
+        for index in ds.indexes.values():
+            if isinstance(index, pd.MultiIndex) or not index.is_unique:
+                return None
+
+        # extension dtypes (e.g., period, tz-aware datetime) and mixed kinds (e.g.,
+        # str and int) cannot be promoted with numpy, the way xr.concat does
+        for d in indexed_dims:
+            dtype = ds[d].dtype
+            if not isinstance(dtype, np.dtype) or dtype.kind != first[d].dtype.kind:
+                return None
+
+    # the outer join of xarray is the union of all indexes
+    unions = {
+        d: functools.reduce(pd.Index.union, [ds.indexes[d] for ds in datasets])
+        for d in indexed_dims
+    }
+
+    def _get_indexer(ds, d):
+        # NOTE: use slices for contiguous positions - much faster than fancy indexing
+        if d not in unions:
+            return slice(None)
+
+        positions = unions[d].get_indexer(ds.indexes[d])
+        if positions.size and (np.diff(positions) == 1).all():
+            return slice(positions[0], positions[-1] + 1)
+        return positions
+
+    # if all indexes are equal no alignment is needed - directly stack the data
+    aligned = all(
+        all(unions[d].equals(ds.indexes[d]) for d in unions) for ds in datasets
+    )
+
+    data_vars = {}
+    for name, da in first.data_vars.items():
+
+        if aligned:
+            out = np.stack([ds[name].data for ds in datasets])
+            data_vars[name] = xr.Variable(
+                (dim,) + da.dims, out, attrs=da.attrs, encoding=da.encoding
+            )
+            continue
+
+        shape = tuple(len(unions[d]) if d in unions else da.sizes[d] for d in da.dims)
+        dtype = np.result_type(*(ds[name].dtype for ds in datasets))
+        out = np.full((len(datasets),) + shape, np.nan, dtype=dtype)
+
+        for i, ds in enumerate(datasets):
+            indexer = tuple(_get_indexer(ds, d) for d in da.dims)
+
+            # several integer arrays must be combined to an open mesh
+            if sum(isinstance(idx, np.ndarray) for idx in indexer) > 1:
+                indexer = np.ix_(*(np.arange(n)[idx] for n, idx in zip(shape, indexer)))
+
+            out[i, ...][indexer] = ds[name].data
+
+        data_vars[name] = xr.Variable(
+            (dim,) + da.dims, out, attrs=da.attrs, encoding=da.encoding
+        )
+
+    coords = {}
+    for name, coord in first.coords.items():
+        if name in non_index_coords:
+            coords[name] = coord.variable
+        else:
+            # NOTE: pandas may change the dtype (e.g. str -> object) - xarray keeps it
+            coord_dtype = np.result_type(*(ds[name].dtype for ds in datasets))
+            values = np.asarray(unions[name], dtype=coord_dtype)
+            coords[name] = xr.Variable(
+                name, values, attrs=coord.attrs, encoding=coord.encoding
+            )
+    coords[dim] = xr.Variable(dim, names)
+
+    ds = xr.Dataset(data_vars, coords=coords, attrs=first.attrs)
+    ds.encoding = first.encoding
+
+    return ds
+
+
 def pool_scen_ens(
     dt: xr.DataTree,
     *,
@@ -178,7 +314,7 @@ def pool_scen_ens(
     else:
         dims = (scenario_dim, member_dim, time_dim)
 
-    out = list()
+    paths, datasets = [], []
     for path, (node,) in xr.group_subtrees(dt):
 
         if node.has_data:
@@ -194,16 +330,154 @@ def pool_scen_ens(
 
                 raise ValueError(msg)
 
-            ds = ds.expand_dims({scenario_dim: [path]})
-            ds = ds.stack({sample_dim: dims}, create_index=False)
+            paths.append(path)
+            datasets.append(ds)
 
-            out.append(ds)
+    pooled = _pool_preallocated(
+        datasets,
+        paths,
+        stack_dims=dims[1:],
+        scenario_dim=scenario_dim,
+        sample_dim=sample_dim,
+    )
+    if pooled is not None:
+        return pooled
+
+    out = list()
+    for path, ds in zip(paths, datasets):
+        ds = ds.expand_dims({scenario_dim: [path]})
+        ds = ds.stack({sample_dim: dims}, create_index=False)
+
+        out.append(ds)
 
     out = xr.concat(out, dim=sample_dim)
 
     return out.transpose(sample_dim, ...)
 
 
+def _pool_preallocated(
+    datasets: list[xr.Dataset],
+    scenarios: list[str],
+    *,
+    stack_dims: tuple[str, ...],
+    scenario_dim: str,
+    sample_dim: str,
+) -> xr.Dataset | None:
+    """pool datasets along the sample dimension using pre-allocated arrays
+
+    Equivalent to expanding each dataset with the scenario, stacking it and
+    concatenating all datasets along ``sample_dim`` (see ``pool_scen_ens``), but the
+    data of each dataset is directly written into its slot of the pooled array (i.e.,
+    the data is copied once instead of twice). The attrs, encoding, and the order of the
+    variables and dims are the same as for this approach. Returns None if the datasets
+    are not supported (e.g., non-numpy data, differing non-sample coords or dims).
+    """
+
+    if not datasets:
+        return None
+
+    first = datasets[0]
+    var_dims = {name: da.dims for name, da in first.data_vars.items()}
+    other_dims = [d for d in first.dims if d not in stack_dims]
+
+    for ds in datasets:
+        if (
+            scenario_dim in ds.variables
+            or sample_dim in ds.variables
+            or {name: da.dims for name, da in ds.data_vars.items()} != var_dims
+            or any(ds.sizes.get(d) != first.sizes[d] for d in other_dims)
+            or set(ds.dims) != set(first.dims)
+            or set(ds.coords) != set(first.coords)
+        ):
+            return None
+
+        for da in ds.data_vars.values():
+            if not isinstance(da.data, np.ndarray):
+                return None
+            if not set(stack_dims) <= set(da.dims):
+                return None
+
+        for name, coord in ds.coords.items():
+            # the stacked dims need a coordinate (but no other coords along them)
+            if set(coord.dims) & set(stack_dims):
+                if coord.dims != (name,):
+                    return None
+            elif not coord.variable.equals(first[name].variable):
+                return None
+
+        if not all(d in ds.coords for d in stack_dims):
+            return None
+
+        # the stacked coords are joined with numpy, which promotes differing dtypes
+        # (e.g., int and str) unlike xr.concat - only str of any length can be mixed
+        for d in stack_dims:
+            dtype, first_dtype = ds[d].dtype, first[d].dtype
+            if not isinstance(dtype, np.dtype):
+                return None
+            if dtype != first_dtype and not dtype.kind == first_dtype.kind == "U":
+                return None
+
+    stack_shapes = [tuple(ds.sizes[d] for d in stack_dims) for ds in datasets]
+    offsets = np.cumsum([0] + [math.prod(shape) for shape in stack_shapes])
+
+    data_vars = {}
+    for name, da in first.data_vars.items():
+        dims = [d for d in da.dims if d not in stack_dims]
+        shape = tuple(first.sizes[d] for d in dims)
+        dtype = np.result_type(*(ds[name].dtype for ds in datasets))
+        out = np.empty((offsets[-1],) + shape, dtype=dtype)
+
+        for ds, stack_shape, start, stop in zip(
+            datasets, stack_shapes, offsets[:-1], offsets[1:]
+        ):
+            # NOTE: out is C-contiguous - reshaping its slice returns a view
+            view = out[start:stop].reshape(stack_shape + shape)
+            view[...] = ds[name].variable.transpose(*stack_dims, *dims).data
+
+        # NOTE: use the layout of stack (sample_dim last) and transpose at the end
+        # as for concatenating the stacked datasets - keeps the order of ``ds.dims``
+        data_vars[name] = xr.Variable(
+            (*dims, sample_dim),
+            np.moveaxis(out, 0, -1),
+            attrs=da.attrs,
+            encoding=da.encoding,
+        )
+
+    # the coords along the sample dimension (the value of each sample)
+    def _sample_coord(ds, stack_shape, d):
+        shape = [1] * len(stack_dims)
+        shape[stack_dims.index(d)] = -1
+        return np.broadcast_to(ds[d].values.reshape(shape), stack_shape).ravel()
+
+    # NOTE: expand_dims creates an object-dtype scenario coordinate - keep it
+    scenario = np.empty(offsets[-1], dtype=object)
+    for scen, start, stop in zip(scenarios, offsets[:-1], offsets[1:]):
+        scenario[start:stop] = scen
+
+    # the scenario coordinate comes first, as after expand_dims
+    coords: dict[Hashable, xr.Variable] = {
+        scenario_dim: xr.Variable(sample_dim, scenario)
+    }
+    for name, coord in first.coords.items():
+        if name in stack_dims:
+            sample_values = np.concatenate(
+                [
+                    _sample_coord(ds, shape, name)
+                    for ds, shape in zip(datasets, stack_shapes)
+                ]
+            )
+            coords[name] = xr.Variable(
+                sample_dim, sample_values, attrs=coord.attrs, encoding=coord.encoding
+            )
+        else:
+            coords[name] = coord.variable
+
+    pooled = xr.Dataset(data_vars, coords=coords, attrs=first.attrs)
+    pooled.encoding = first.encoding
+
+    return pooled.transpose(sample_dim, ...)
+
+
 def _unpool_scen_ens(
     obj: xr.DataArray | xr.Dataset,
     *,
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import xarray as xr
 
@@ -7,24 +8,60 @@ from mesmer.datatree import _datatree_wrapper
 
 def _lon_to_180(lon):
 
-    with xr.set_options(keep_attrs=True):
-        lon = ((lon + 180) % 360) - 180
+    # NOTE: operate on the underlying array to avoid the xarray overhead of
+    # each operation - and only allocate one temporary
+    wrapped = np.asarray(lon) + 180
 
-    if isinstance(lon, xr.DataArray):
-        lon = lon.assign_coords({lon.name: lon})
+    # scalar input returns a numpy scalar, which cannot be updated in-place
+    if isinstance(wrapped, np.ndarray):
+        np.mod(wrapped, 360, out=wrapped)
+        wrapped -= 180
+    else:
+        wrapped = wrapped % 360 - 180
 
-    return lon
+    return _replace_lon(lon, wrapped)
 
 
 def _lon_to_360(lon):
 
-    with xr.set_options(keep_attrs=True):
-        lon = lon % 360
+    wrapped = np.mod(np.asarray(lon), 360)
 
-    if isinstance(lon, xr.DataArray):
-        lon = lon.assign_coords({lon.name: lon})
+    return _replace_lon(lon, wrapped)
 
-    return lon
+
+def _replace_lon(lon, wrapped):
+    """replace the data and the index of a longitude DataArray, keeping the attrs"""
+
+    if not isinstance(lon, xr.DataArray):
+        return wrapped
+
+    # NOTE: constructing the DataArray from variables is cheaper than assign_coords
+    variable = lon.variable.copy(deep=False, data=wrapped)
+    coords = {name: coord.variable for name, coord in lon.coords.items()}
+    coords[lon.name] = variable
+
+    return xr.DataArray(variable, coords=coords, name=lon.name)
+
+
+def _assign_and_sort_lon(obj, new_lon, lon_name):
+
+    if new_lon.ndim != 1:
+        raise ValueError(f"'{lon_name}' should be 1D, but is {new_lon.ndim}D")
+
+    obj = obj.assign_coords(coords={lon_name: new_lon})
+
+    # NOTE: skip reordering (i.e. copying) the data if the wrapped lon is sorted
+    lon = new_lon.values
+    if (lon[1:] >= lon[:-1]).all():
+        return obj
+
+    # NOTE: sort with argsort & isel - avoids the overhead of sortby
+    order = np.argsort(lon, kind="stable")
+
+    # lon is not necessarily a dimension coordinate (e.g., along the gridcell dim)
+    (lon_dim,) = new_lon.dims
+
+    return obj.isel({lon_dim: order})
 
 
 @_datatree_wrapper
@@ -47,8 +84,7 @@ def wrap_to_180(obj: T_DataArraySetTree, lon_name: str = "lon") -> T_DataArraySe
 
     new_lon = _lon_to_180(obj[lon_name])
 
-    obj = obj.assign_coords(coords={lon_name: new_lon})
-    obj = obj.sortby(lon_name)
+    obj = _assign_and_sort_lon(obj, new_lon, lon_name)
 
     return obj
 
@@ -73,8 +109,7 @@ def wrap_to_360(obj: T_DataArraySetTree, lon_name: str = "lon") -> T_DataArraySe
 
     new_lon = _lon_to_360(obj[lon_name])
 
-    obj = obj.assign_coords(coords={lon_name: new_lon})
-    obj = obj.sortby(lon_name)
+    obj = _assign_and_sort_lon(obj, new_lon, lon_name)
 
     return obj
 
@@ -11,8 +11,9 @@ from mesmer._core.utils import _check_dataarray_form
 def _yeo_johnson_transform_np(data, lambdas):
     """transform data using Yeo-Johnson transformation with variable lambda.
 
-    Input is for one month and gridcell but all years. This function is adjusted
-    from sklearn to accommodate variable lambdas for each value.
+    The transformation is applied element-wise, i.e., data and lambdas can have any
+    (broadcastable) shape. This function is adjusted from sklearn to accommodate
+    variable lambdas for each value.
 
     Notes
     -----
@@ -32,41 +33,61 @@ def _yeo_johnson_transform_np(data, lambdas):
     <https://scikit-learn.org/stable/modules/generated/sklearn.preprocessing.PowerTransformer.html>`_
     """
 
+    # the transformation is element-wise - but lambdas may have more dims than data
+    # NOTE: always return float64 (as declared in apply_ufunc), also for float32 data
+    data = np.asarray(data, dtype=float)
+    shape = np.broadcast_shapes(data.shape, np.shape(lambdas))
+    data = np.broadcast_to(data, shape)
+
     return _yeo_johnson_transform_optimized(data)(lambdas)
 
 
 def _yeo_johnson_transform_optimized(data):
     """performance-optimize yeo-johnson transformation - for the inner loop of minimize"""
 
+    # NOTE: compute in float64 - the buffers must not round the lambdas (e.g. to float32)
+    data = np.asarray(data, dtype=np.float64)
+
     # pre-compute constant values
 
     eps = np.finfo(np.float64).eps
 
-    transf = np.empty_like(data)
-
     data_log1p = np.log1p(np.abs(data))
 
     pos = data >= 0
 
+    # NOTE: the transformed data is non-negative before the sign is applied, so
+    # multiplying with the sign is equivalent to ``np.copysign`` (but cheaper)
+    sign_data = np.where(pos, 1.0, -1.0)
+
+    # pre-allocate buffers - they are re-used for every call
+    lmbds = np.empty_like(data)
+    lmbds_eq_0_or_2 = np.empty(data.shape, dtype=bool)
+    transf = np.empty_like(data)
+
     def _inner(lambdas):
 
         # NOTE: this code is adapted from sklearn's PowerTransformer, see
         # https://github.com/scikit-learn/scikit-learn/blob/8721245511de2f225ff5f9aa5f5fadce663cd4a3/sklearn/preprocessing/_data.py#L3396
 
         # align lambdas for pos and neg data - so we only have two cases
-        # NOTE: cannot do this inplace; `where` is faster than copying & subsetting
-        lambdas = np.where(pos, lambdas, 2.0 - lambdas)
+        np.subtract(2.0, lambdas, out=lmbds)
+        np.copyto(lmbds, lambdas, where=pos)
 
         # NOTE: abs(2 - a) == abs(a - 2)
-        lmbds_eq_0_or_2 = np.abs(lambdas) <= eps
-        lmbds_ne_0_or_2 = ~lmbds_eq_0_or_2
+        np.abs(lmbds, out=transf)
+        np.less_equal(transf, eps, out=lmbds_eq_0_or_2)
 
-        transf[lmbds_eq_0_or_2] = data_log1p[lmbds_eq_0_or_2]
+        np.multiply(data_log1p, lmbds, out=transf)
+        np.expm1(transf, out=transf)
 
-        lmbds = lambdas[lmbds_ne_0_or_2]
-        transf[lmbds_ne_0_or_2] = np.expm1(data_log1p[lmbds_ne_0_or_2] * lmbds) / lmbds
+        # select the cases with `copyto` instead of boolean indexing (fewer passes over
+        # the data); use a safe divisor for the lambda == 0 case
+        np.copyto(lmbds, 1.0, where=lmbds_eq_0_or_2)
+        np.divide(transf, lmbds, out=transf)
+        np.copyto(transf, data_log1p, where=lmbds_eq_0_or_2)
 
-        np.copysign(transf, data, out=transf)
+        np.multiply(transf, sign_data, out=transf)
 
         return transf
 
@@ -97,24 +118,30 @@ def _yeo_johnson_inverse_transform_np(data, lambdas):
 
     eps = np.finfo(np.float64).eps
 
-    transf = np.empty_like(data)
-    # get positions of four cases:
-    sel_a = (data >= 0) & (np.abs(lambdas) < eps)
-    sel_b = (data >= 0) & (np.abs(lambdas) >= eps)
-    sel_c = (data < 0) & (np.abs(lambdas - 2) > eps)
-    sel_d = (data < 0) & (np.abs(lambdas - 2) <= eps)
+    neg = data < 0
+
+    # align lambdas and data for pos and neg data - so we only have two cases
+    lmbds = np.where(neg, 2.0 - lambdas, lambdas)
+    sign = np.where(neg, -1.0, 1.0)
+    data = sign * data
 
-    # assign values for the four cases
-    transf[sel_a] = np.expm1(data[sel_a])
+    # NOTE: lambda == 2 is tested with '<=' for negative data, but lambda == 0 with '<'
+    buf = np.empty_like(lmbds)
+    np.abs(lmbds, out=buf)
+    lmbds_eq_0_or_2 = np.where(neg, buf <= eps, buf < eps)
 
-    lmbds = lambdas[sel_b]
-    transf[sel_b] = np.expm1(np.log1p(data[sel_b] * lmbds) / lmbds)
+    # both cases can be expressed as expm1 - use a safe divisor for lambda == 0
+    # NOTE: evaluate the transcendental functions in-place to avoid temporaries
+    np.copyto(lmbds, 1.0, where=lmbds_eq_0_or_2)
+    np.multiply(data, lmbds, out=buf)
+    np.log1p(buf, out=buf)
+    np.divide(buf, lmbds, out=buf)
+    np.copyto(buf, data, where=lmbds_eq_0_or_2)
 
-    lmbds = 2 - lambdas[sel_c]
-    transf[sel_c] = -np.expm1(np.log1p(-lmbds * data[sel_c]) / lmbds)
-    transf[sel_d] = -np.expm1(-data[sel_d])
+    np.expm1(buf, out=buf)
+    np.multiply(buf, sign, out=buf)
 
-    return transf
+    return buf
 
 
 def logistic_lambda_function(
@@ -252,11 +279,22 @@ class YeoJohnsonTransformer:
 
     def _optimize_lambda_np(self, monthly_residuals, yearly_pred):
 
+        monthly_residuals = np.ravel(monthly_residuals)
+        yearly_pred = np.ravel(yearly_pred)
+
         # the computation of lambda is influenced by NaNs so we need to
-        # get rid of them
+        # get rid of them - NaNs are rare, only subset (i.e., copy) if there are any
         isnan = np.isnan(monthly_residuals) | np.isnan(yearly_pred)
-        monthly_residuals = monthly_residuals[~isnan]
-        yearly_pred = yearly_pred[~isnan]
+        if isnan.any():
+            notnan = ~isnan
+            monthly_residuals = monthly_residuals[notnan]
+            yearly_pred = yearly_pred[notnan]
+
+        n_samples = monthly_residuals.shape[0]
+
+        # lambda is undetermined without variance (e.g., all-NaN or constant data)
+        if n_samples < 2 or np.ptp(monthly_residuals) == 0:
+            return self.first_guess.copy()
 
         # initialize constant arrays
         _yeo_johnson_transform = _yeo_johnson_transform_optimized(monthly_residuals)
@@ -272,10 +310,17 @@ class YeoJohnsonTransformer:
 
             transformed_resids = _yeo_johnson_transform(lambdas)
 
-            n_samples = monthly_residuals.shape[0]
-            loglikelihood = -n_samples / 2 * np.log(transformed_resids.var())
+            # NOTE: compute the variance and the sum of ``lambdas * data_log1p`` as
+            # dot products - avoids allocating two temporary arrays per call
+            anomalies = transformed_resids - transformed_resids.mean()
+            var = np.dot(anomalies, anomalies) / n_samples
+            loglikelihood = -n_samples / 2 * np.log(var)
 
-            loglikelihood += (lambdas * data_log1p).sum() - data_log1p_sum
+            # "constant" lambda_function returns a scalar
+            if np.ndim(lambdas):
+                loglikelihood += np.dot(lambdas, data_log1p) - data_log1p_sum
+            else:
+                loglikelihood += (lambdas - 1) * data_log1p_sum
 
             return -loglikelihood
 
@@ -338,13 +383,24 @@ class YeoJohnsonTransformer:
 
         self._assert_correct_lambda_function(lambda_coeffs)
 
+        def _lambda_function(coeffs, yearly_pred):
+            # the lambda functions broadcast - so we don't need to vectorize but
+            # "coeff" (passed as last axis) has to be moved to the front
+            lambdas = self.lambda_function(np.moveaxis(coeffs, -1, 0), yearly_pred)
+
+            # "constant" lambda_function does not broadcast to yearly_pred
+            shape = np.broadcast_shapes(coeffs.shape[:-1], yearly_pred.shape)
+            if np.shape(lambdas) != shape:
+                lambdas = np.full(shape, lambdas)
+
+            return lambdas
+
         lambdas = xr.apply_ufunc(
-            self.lambda_function,
+            _lambda_function,
             lambda_coeffs,
             yearly_pred,
             input_core_dims=[("coeff",), []],
             output_core_dims=[[]],
-            vectorize=True,
             dask="parallelized",
             output_dtypes=[float],
         )
@@ -412,26 +468,36 @@ class YeoJohnsonTransformer:
         # i.e., time_dim and sample_dim may or may not be the same
         (sample_dim,) = yearly_pred[time_dim].dims
 
-        lambda_coeffs = []
-        for month in range(12):
+        # reshape the monthly residuals to (year, month) - this allows to fit all
+        # months in one go (month is the fastest changing index)
+        sample_coords = [
+            name
+            for name, coord in monthly_residuals.coords.items()
+            if sample_dim in coord.dims
+        ]
+        monthly_residuals = monthly_residuals.drop_vars(sample_coords)
+        monthly_residuals = monthly_residuals.coarsen({sample_dim: 12}).construct(
+            {sample_dim: ("__year__", "month")}
+        )
 
-            monthly_data = monthly_residuals.isel({sample_dim: slice(month, None, 12)})
+        # gridcells are fit independently - so dask can fit each chunk in parallel
+        n_coeffs = len(self.first_guess)
 
-            res = xr.apply_ufunc(
-                self._optimize_lambda_np,
-                monthly_data,
-                yearly_pred,
-                input_core_dims=[[sample_dim], [sample_dim]],
-                exclude_dims={sample_dim},
-                output_core_dims=[["coeff"]],
-                output_dtypes=[float],
-                vectorize=True,
-            )
-            res = res.assign_coords({"coeff": np.arange(len(res.coeff))})
-            lambda_coeffs.append(res.rename("lambda_coeffs"))
+        res = xr.apply_ufunc(
+            self._optimize_lambda_np,
+            monthly_residuals,
+            yearly_pred,
+            input_core_dims=[["__year__"], [sample_dim]],
+            output_core_dims=[["coeff"]],
+            output_dtypes=[float],
+            vectorize=True,
+            dask="parallelized",
+            dask_gufunc_kwargs={"output_sizes": {"coeff": n_coeffs}},
+        )
 
-        month_dim = xr.DataArray(np.arange(1, 13), dims="month")
-        res = xr.concat(lambda_coeffs, dim=month_dim)
+        res = res.transpose("month", ...)
+        res = res.assign_coords(month=np.arange(1, 13), coeff=np.arange(n_coeffs))
+        res = res.rename("lambda_coeffs")
         res.attrs = {"lambda_function": self.name}
 
         return res
@@ -521,7 +587,7 @@ class YeoJohnsonTransformer:
             input_core_dims=[[sample_dim], [sample_dim]],
             output_core_dims=[[sample_dim]],
             output_dtypes=[float],
-            vectorize=True,
+            dask="parallelized",
         ).rename("transformed")
 
         return xr.merge([transformed_resids, lambdas], compat="override")
@@ -603,7 +669,7 @@ class YeoJohnsonTransformer:
             input_core_dims=[[sample_dim], [sample_dim]],
             output_core_dims=[[sample_dim]],
             output_dtypes=[float],
-            vectorize=True,
+            dask="parallelized",
         ).rename("inverted")
 
         return xr.merge([inverted_resids, lambdas], compat="override")
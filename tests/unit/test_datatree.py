@@ -1,6 +1,7 @@
 import re
 
 import numpy as np
+import pandas as pd
 import pytest
 import xarray as xr
 from packaging.version import Version
@@ -11,6 +12,13 @@ from mesmer.datatree import _datatree_wrapper, map_over_datasets
 from mesmer.testing import trend_data_1D, trend_data_2D
 
 
+def _all_nan(obj):
+    # np.isnan(ds).all() returns a Dataset, which is truthy whenever it has data
+    # variables - check the values of each variable instead
+    arrays = obj.data_vars.values() if isinstance(obj, xr.Dataset) else [obj]
+    return all(np.isnan(arr.values).all() for arr in arrays)
+
+
 def test_collapse_datatree_into_dataset():
     n_ts = 30
     ds1 = xr.Dataset({"tas": trend_data_1D(n_timesteps=n_ts)})
@@ -31,7 +39,7 @@ def test_collapse_datatree_into_dataset():
     assert collapse_dim in res.dims
     assert (res[collapse_dim] == ["scen1", "scen2"]).all()
     assert len(res.dims) == 3
-    assert np.isnan(res.sel(scenario="scen2", member=2)).all()
+    assert _all_nan(res.sel(scenario="scen2", member=2))
 
     # error if data set has no coords along dim (bc then it is not concatenable if lengths differ)
     leaf_missing_coords = leaf1.drop_vars("member")
@@ -101,7 +109,7 @@ def test_collapse_datatree_into_dataset():
     assert len(res.dims) == 3
     assert (res[collapse_dim] == ["scen1", "scen2", "scen3"]).all()
     assert len(res.data_vars) == 2
-    assert np.isnan(res.sel(scenario="scen1").tas2).all()
+    assert _all_nan(res.sel(scenario="scen1").tas2)
 
     # two time dimensions that have different length fills missing values with nans
     ds_with_different_time = ds1.shift(time=1)
@@ -111,7 +119,9 @@ def test_collapse_datatree_into_dataset():
 
     res = mesmer.datatree.collapse_datatree_into_dataset(dt, dim=collapse_dim)
 
-    assert np.isnan(res.sel(scenario="scen2", time=leaf1.time)).all()
+    assert _all_nan(res.sel(scenario="scen2", member=[1, 2]))
+    assert _all_nan(res.sel(scenario="scen2").isel(time=0))
+    assert not _all_nan(res.sel(scenario="scen2", member=0).isel(time=slice(1, None)))
 
     # make sure it also works with stacked dimension
     # NOTE: only works if the stacked dimension has the same size on all datasets
@@ -135,6 +145,98 @@ def test_collapse_datatree_into_dataset():
     xr.testing.assert_equal(res, expected)
 
 
+@pytest.mark.parametrize("dtype", ["float64", "float32", "int64"])
+def test_collapse_datatree_into_dataset_same_as_concat(dtype, tmp_path):
+    # ensure the pre-aligned fast path gives the same result as xr.concat
+
+    n_ts = 30
+    ds1 = xr.Dataset({"tas": trend_data_2D(n_timesteps=n_ts, n_lat=2, n_lon=3)})
+    ds1 = ds1.astype(dtype)
+    ds1.attrs = {"name": "test"}
+    ds1.tas.attrs = {"units": "K"}
+    ds1.time.attrs = {"axis": "T"}
+
+    dim = xr.Variable("member", [2, 1, 0])
+    leaf1 = xr.concat([ds1, ds1 * 2, ds1 * 3], dim=dim)
+    dim = xr.Variable("member", [1, 3])
+    leaf2 = xr.concat([ds1, ds1 * 2], dim=dim).isel(time=slice(5, None, -1))
+
+    dt = xr.DataTree.from_dict({"scen1": leaf1, "scen2": leaf2})
+
+    res = mesmer.datatree.collapse_datatree_into_dataset(dt, dim="scenario")
+
+    expected = xr.concat([leaf1, leaf2], dim="scenario", join="outer")
+    expected = expected.assign_coords(scenario=["scen1", "scen2"])
+
+    xr.testing.assert_identical(res, expected)
+    assert res.tas.dtype == expected.tas.dtype
+
+    # already aligned
+    dt = xr.DataTree.from_dict({"scen1": leaf1, "scen2": leaf1 * 2})
+
+    res = mesmer.datatree.collapse_datatree_into_dataset(dt, dim="scenario")
+
+    expected = xr.concat([leaf1, leaf1 * 2], dim="scenario", join="outer")
+    expected = expected.assign_coords(scenario=["scen1", "scen2"])
+
+    xr.testing.assert_identical(res, expected)
+    assert res.tas.dtype == expected.tas.dtype
+
+    # leaves loaded from netCDF - the encoding must be kept
+    for name, leaf in {"scen1": leaf1, "scen2": leaf2, "scen3": leaf1 * 2}.items():
+        leaf.to_netcdf(tmp_path / f"{name}.nc")
+
+    def _open(name):
+        with xr.open_dataset(tmp_path / f"{name}.nc") as ds:
+            return ds.load()
+
+    # misaligned and already aligned
+    for names in (["scen1", "scen2"], ["scen1", "scen3"]):
+        leaves = [_open(name) for name in names]
+        dt = xr.DataTree.from_dict(dict(zip(names, leaves)))
+
+        res = mesmer.datatree.collapse_datatree_into_dataset(dt, dim="scenario")
+
+        expected = xr.concat(leaves, dim="scenario", join="outer")
+        expected = expected.assign_coords(scenario=names)
+
+        xr.testing.assert_identical(res, expected)
+        assert res.encoding == expected.encoding
+        for name in expected.variables:
+            assert res[name].encoding == expected[name].encoding
+
+    # indexes with extension dtypes or of mixed kinds
+    period = pd.period_range("2000", periods=3, freq="Y")
+    tz_aware = pd.date_range("2000-01-01", periods=3, tz="UTC")
+    cases = [
+        ({"time": period, "member": [0, 1]}, {"time": period, "member": [1]}),
+        ({"time": tz_aware, "member": [0, 1]}, {"time": tz_aware, "member": [1]}),
+        (
+            {"time": [0, 1, 2], "member": ["a", "b"]},
+            {"time": [0, 1, 2], "member": [1, 2]},
+        ),
+    ]
+
+    for coords1, coords2 in cases:
+        leaves = [
+            xr.Dataset(
+                {"tas": (("member", "time"), np.ones((len(c["member"]), 3), dtype))},
+                coords=c,
+            )
+            for c in (coords1, coords2)
+        ]
+        dt = xr.DataTree.from_dict({"scen1": leaves[0], "scen2": leaves[1]})
+
+        res = mesmer.datatree.collapse_datatree_into_dataset(dt, dim="scenario")
+
+        expected = xr.concat(leaves, dim="scenario", join="outer")
+        expected = expected.assign_coords(scenario=["scen1", "scen2"])
+
+        xr.testing.assert_identical(res, expected)
+        for name in expected.coords:
+            assert res[name].dtype == expected[name].dtype
+
+
 def test_extract_single_dataarray_from_dt():
     da = trend_data_1D(n_timesteps=30).rename("tas")
     dt = xr.DataTree.from_dict({"/": xr.Dataset({"tas": da})})
@@ -172,6 +274,21 @@ def test_extract_single_dataarray_from_dt():
         mesmer.datatree._extract_single_dataarray_from_dt(xr.DataTree())
 
 
+def _assert_pooled_aligned(a, b, sample_dim="sample"):
+    # the sample dim has no index, so xr.align(..., join="exact") only compares its
+    # size - directly compare the coords of each sample and the shared dims instead
+
+    for dim in set(a.dims) & set(b.dims):
+        assert a.sizes[dim] == b.sizes[dim]
+
+    def _sample_coords(obj):
+        return {name for name, coord in obj.coords.items() if sample_dim in coord.dims}
+
+    assert _sample_coords(a) == _sample_coords(b)
+    for name in _sample_coords(a):
+        np.testing.assert_array_equal(a[name].values, b[name].values)
+
+
 def test_broadcast_and_pool_scen_ens():
     n_ts, n_lat, n_lon = 30, 2, 3
     member_dim = "member"
@@ -179,30 +296,22 @@ def test_broadcast_and_pool_scen_ens():
     scenario_dim = "scenario"
     stacked_dim = "sample"
 
-    d2D_1 = xr.Dataset(
-        {"tas": trend_data_2D(n_timesteps=n_ts, n_lat=n_lat, n_lon=n_lon)}
-    )
-    d2D_2 = d2D_1 * 2
-    d2D_3 = d2D_1 * 3
-    d2D_4 = d2D_1 * 4
-    d2D_5 = d2D_1 * 5
+    d2D = xr.Dataset({"tas": trend_data_2D(n_timesteps=n_ts, n_lat=n_lat, n_lon=n_lon)})
 
-    leaf1 = xr.concat([d2D_1, d2D_2, d2D_3], dim=member_dim).assign_coords(
-        {member_dim: np.arange(3)}
-    )
-    leaf2 = xr.concat([d2D_4, d2D_5], dim=member_dim).assign_coords(
-        {member_dim: np.arange(2)}
-    )
+    # the members are multiples of the trend data - create all in one operation
+    scales = xr.DataArray(np.arange(1, 6), dims=member_dim)
+    members = (d2D * scales).transpose(member_dim, ...)
+
+    leaf1 = members.isel({member_dim: slice(0, 3)})
+    leaf1 = leaf1.assign_coords({member_dim: np.arange(3)})
+    leaf2 = members.isel({member_dim: slice(3, 5)})
+    leaf2 = leaf2.assign_coords({member_dim: np.arange(2)})
 
     target = xr.DataTree.from_dict({"scen1": leaf1, "scen2": leaf2})
 
-    d1D_1 = xr.Dataset(
-        {
-            "tas": trend_data_1D(n_timesteps=n_ts),
-            "tas2": trend_data_1D(n_timesteps=n_ts) ** 2,
-            "hfds": trend_data_1D(n_timesteps=n_ts) * 0.5,
-        }
-    )
+    # the trend data is seeded - generate it once
+    tas = trend_data_1D(n_timesteps=n_ts)
+    d1D_1 = xr.Dataset({"tas": tas, "tas2": tas**2, "hfds": tas * 0.5})
     d1D_2 = d1D_1 * 2
 
     predictors = xr.DataTree.from_dict({"scen1": d1D_1, "scen2": d1D_2})
@@ -252,17 +361,8 @@ def test_broadcast_and_pool_scen_ens():
     )
 
     # check if datasets align
-    target_aligned, predictors_aligned = xr.align(
-        target_stacked, predictors_stacked, join="exact"
-    )
-    xr.testing.assert_equal(target_stacked, target_aligned)
-    xr.testing.assert_equal(predictors_stacked, predictors_aligned)
-
-    target_aligned, weights_aligned = xr.align(
-        target_stacked, weights_stacked, join="exact"
-    )
-    xr.testing.assert_equal(target_stacked, target_aligned)
-    xr.testing.assert_equal(weights_stacked, weights_aligned)
+    _assert_pooled_aligned(target_stacked, predictors_stacked)
+    _assert_pooled_aligned(target_stacked, weights_stacked)
 
     predictors_stacked, target_stacked, weights_stacked = (
         mesmer.datatree.broadcast_and_pool_scen_ens(predictors, target, None)
@@ -278,11 +378,7 @@ def test_broadcast_and_pool_scen_ens():
         )
     )
 
-    target_aligned, predictors_aligned = xr.align(
-        target_stacked, predictors_stacked, join="exact"
-    )
-    xr.testing.assert_equal(target_stacked, target_aligned)
-    xr.testing.assert_equal(predictors_stacked, predictors_aligned)
+    _assert_pooled_aligned(target_stacked, predictors_stacked)
 
 
 def test_datatree_wrapper_dt_kwarg_errors():
@@ -444,6 +540,55 @@ def test_pool_scen_ens_keep_other_dims():
     )
 
 
+def test_pool_scen_ens_dask(tmp_path):
+    # dask arrays are pooled with xr.concat - ensure the results are the same
+
+    n_ts, n_lat, n_lon = 30, 2, 3
+    d2D_1 = xr.Dataset(
+        {"tas": trend_data_2D(n_timesteps=n_ts, n_lat=n_lat, n_lon=n_lon)}
+    )
+    d2D_1.tas.attrs = {"units": "K"}
+    d2D_1["hfds"] = d2D_1.tas * 0.5
+
+    leaf1 = xr.concat([d2D_1, d2D_1 * 2, d2D_1 * 3], dim="member")
+    leaf1 = leaf1.assign_coords(member=np.arange(3))
+    leaf2 = xr.concat([d2D_1 * 4], dim="member").isel(time=slice(10))
+    leaf2 = leaf2.assign_coords(member=[5])
+
+    # load the leaves from netCDF so they have an encoding
+    leaves = {}
+    for name, leaf in {"scen1": leaf1, "scen2": leaf2}.items():
+        leaf.to_netcdf(tmp_path / f"{name}.nc")
+        with xr.open_dataset(tmp_path / f"{name}.nc") as ds:
+            leaves[name] = ds.load()
+
+    dt = xr.DataTree.from_dict(leaves)
+
+    expected = mesmer.datatree.pool_scen_ens(dt)
+    result = mesmer.datatree.pool_scen_ens(dt.chunk())
+
+    assert result.tas.chunks is not None
+    xr.testing.assert_identical(result.compute(), expected)
+
+    # the order of the dims and variables as well as the encoding must be the same
+    assert tuple(result.dims) == tuple(expected.dims)
+    assert list(result.variables) == list(expected.variables)
+
+    assert result.encoding == expected.encoding
+    for name in expected.variables:
+        assert result[name].encoding == expected[name].encoding
+
+    # stacked coords with differing dtypes are promoted as for xr.concat
+    leaf2 = leaf2.assign_coords(member=["x"])
+    dt = xr.DataTree.from_dict({"scen1": leaf1, "scen2": leaf2})
+
+    expected = mesmer.datatree.pool_scen_ens(dt.chunk())
+    result = mesmer.datatree.pool_scen_ens(dt)
+
+    xr.testing.assert_identical(result, expected.compute())
+    assert result.member.dtype == expected.member.dtype
+
+
 @pytest.mark.parametrize("scenario_dim", ("scenario", "scen"))
 @pytest.mark.parametrize("time_dim", ("time", "t"))
 @pytest.mark.parametrize("member_dim", ("member", "m"))
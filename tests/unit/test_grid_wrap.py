@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 import xarray as xr
 
 import mesmer
@@ -30,6 +31,17 @@ def test_lon_to_180():
     assert result.attrs == expected.attrs
 
 
+@pytest.mark.parametrize("lon", [370, 370.0, np.float32(370.0), np.array(370.0)])
+def test_lon_to_180_scalar(lon):
+
+    result = mesmer.grid._lon_to_180(lon)
+    assert result == 10
+    assert np.ndim(result) == 0
+
+    result = mesmer.grid._lon_to_180(-lon)
+    assert result == -10
+
+
 def test_lon_to_360():
 
     arr = np.array([-180.1, -180, -1, 0, 179.99, 180, 179 + 2 * 360, 259.9, 360])
@@ -55,6 +67,17 @@ def test_lon_to_360():
     assert result.attrs == expected.attrs
 
 
+@pytest.mark.parametrize("lon", [370, 370.0, np.float32(370.0), np.array(370.0)])
+def test_lon_to_360_scalar(lon):
+
+    result = mesmer.grid._lon_to_360(lon)
+    assert result == 10
+    assert np.ndim(result) == 0
+
+    result = mesmer.grid._lon_to_360(-lon)
+    assert result == 350
+
+
 def test_wrap_to_180(datatype):
 
     attrs = {"name": "test"}
@@ -131,7 +154,7 @@ def test_wrap_to_360(datatype):
     xr.testing.assert_identical(result, expected)
 
 
-def _get_test_data_grid(lon, datatype):
+def _get_test_data_grid(lon, datatype, chunks=None):
     lat = np.arange(90, -91, -10)
 
     data = np.random.randn(lat.size, lon.size)
@@ -145,28 +168,123 @@ def _get_test_data_grid(lon, datatype):
         attrs=attrs,
     )
 
+    if chunks is not None:
+        orig = orig.chunk(chunks)
+
     return _convert(orig, datatype)
 
 
-def test_wrap_to_360_roundtrip(datatype):
+def _get_data(obj):
+
+    if isinstance(obj, xr.DataTree):
+        return obj["node/data"]
+
+    if isinstance(obj, xr.Dataset):
+        return obj["data"]
+
+    return obj
+
+
+@pytest.mark.parametrize("chunks", [None, {"lon": 60}])
+def test_wrap_to_360_roundtrip(datatype, chunks):
 
     lon = np.arange(-180, 180)
 
-    orig = _get_test_data_grid(lon, datatype)
+    orig = _get_test_data_grid(lon, datatype, chunks=chunks)
 
     wrapped = mesmer.grid.wrap_to_360(orig)
     roundtripped = mesmer.grid.wrap_to_180(wrapped)
 
+    # ensure the data stays lazy
+    if chunks is not None:
+        assert _get_data(roundtripped).chunks is not None
+
     xr.testing.assert_identical(orig, roundtripped)
 
 
-def test_wrap_to_180_roundtrip(datatype):
+@pytest.mark.parametrize("chunks", [None, {"lon": 60}])
+def test_wrap_to_180_roundtrip(datatype, chunks):
 
     lon = np.arange(0, 360)
 
-    orig = _get_test_data_grid(lon, datatype)
+    orig = _get_test_data_grid(lon, datatype, chunks=chunks)
 
     wrapped = mesmer.grid.wrap_to_180(orig)
     roundtripped = mesmer.grid.wrap_to_360(wrapped)
 
+    # ensure the data stays lazy
+    if chunks is not None:
+        assert _get_data(roundtripped).chunks is not None
+
+    xr.testing.assert_identical(orig, roundtripped)
+
+
+@pytest.mark.parametrize(
+    "lon, wrap_to, wrap_back",
+    [
+        (np.arange(-180, 180, 30), "wrap_to_360", "wrap_to_180"),
+        (np.arange(0, 360, 30), "wrap_to_180", "wrap_to_360"),
+    ],
+)
+def test_wrap_roundtrip_stacked(datatype, lon, wrap_to, wrap_back):
+    # lon is not a dimension coordinate on a stacked grid
+
+    orig = _get_test_data_grid(lon, "DataArray")
+    orig = mesmer.grid.stack_lat_lon(orig).sortby("lon")
+    orig = _convert(orig, datatype)
+
+    wrapped = getattr(mesmer.grid, wrap_to)(orig)
+
+    lon = _get_data(wrapped).lon.values
+    assert (lon[1:] >= lon[:-1]).all()
+
+    roundtripped = getattr(mesmer.grid, wrap_back)(wrapped)
+
     xr.testing.assert_identical(orig, roundtripped)
+
+
+def test_wrap_stacked_unsorted(datatype):
+
+    lon = np.arange(0, 360, 30)
+    grid = _get_test_data_grid(lon, "DataArray")
+
+    # stacked longitudes are not sorted
+    stacked = mesmer.grid.stack_lat_lon(grid)
+    result = mesmer.grid.wrap_to_180(_convert(stacked, datatype))
+
+    expected = stacked.assign_coords(lon=mesmer.grid._lon_to_180(stacked.lon))
+    expected = _convert(expected.sortby("lon"), datatype)
+
+    xr.testing.assert_identical(result, expected)
+
+
+def test_wrap_already_wrapped(datatype):
+
+    lon = np.arange(-180, 180)
+    orig = _get_test_data_grid(lon, datatype)
+
+    result = mesmer.grid.wrap_to_180(orig)
+    xr.testing.assert_identical(result, orig)
+
+    lon = np.arange(0, 360)
+    orig = _get_test_data_grid(lon, datatype)
+
+    result = mesmer.grid.wrap_to_360(orig)
+    xr.testing.assert_identical(result, orig)
+
+
+@pytest.mark.parametrize("wrap", ["wrap_to_180", "wrap_to_360"])
+def test_wrap_lon_not_1D(datatype, wrap):
+
+    # rows of the 2D lon repeat - the sorted check must not pass
+    lon = np.tile(np.arange(0, 360, 30), (3, 1))
+    orig = xr.DataArray(
+        np.random.randn(*lon.shape),
+        dims=("y", "x"),
+        coords={"lon": (("y", "x"), lon)},
+        name="data",
+    )
+    orig = _convert(orig, datatype)
+
+    with pytest.raises(ValueError, match="'lon' should be 1D, but is 2D"):
+        getattr(mesmer.grid, wrap)(orig)
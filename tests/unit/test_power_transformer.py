@@ -133,6 +133,67 @@ def test_yeo_johnson_optimize_lambda_np(skew, bounds):
     np.testing.assert_allclose(sp.stats.skew(transformed), 0, atol=0.1)
 
 
+@pytest.mark.parametrize("name", ["constant", "logistic"])
+def test_yeo_johnson_optimize_lambda_np_nan(name):
+    np.random.seed(0)
+    n_years = 100
+
+    yearly_T = np.random.randn(n_years)
+    local_monthly_residuals = sp.stats.skewnorm.rvs(2, size=n_years)
+
+    yj_transformer = YeoJohnsonTransformer(name)
+    expected = yj_transformer._optimize_lambda_np(local_monthly_residuals, yearly_T)
+
+    yearly_T_nan = np.append(yearly_T, [np.nan, 1.0])
+    residuals_nan = np.append(local_monthly_residuals, [1.0, np.nan])
+    result = yj_transformer._optimize_lambda_np(residuals_nan, yearly_T_nan)
+
+    np.testing.assert_equal(result, expected)
+
+
+@pytest.mark.parametrize("name", ["constant", "logistic"])
+@pytest.mark.parametrize(
+    "local_monthly_residuals, yearly_T",
+    [
+        pytest.param(np.full(10, np.nan), np.arange(10.0), id="all_nan"),
+        pytest.param(np.array([]), np.array([]), id="empty"),
+        pytest.param(np.full(10, 3.0), np.arange(10.0), id="constant_data"),
+        pytest.param(np.zeros(10), np.arange(10.0), id="zeros"),
+        pytest.param(np.array([1.5]), np.array([0.3]), id="single_sample"),
+    ],
+)
+def test_yeo_johnson_optimize_lambda_np_degenerate(
+    name, local_monthly_residuals, yearly_T
+):
+    # lambda is undetermined for data without variance - return the first guess
+
+    yj_transformer = YeoJohnsonTransformer(name)
+    result = yj_transformer._optimize_lambda_np(local_monthly_residuals, yearly_T)
+
+    np.testing.assert_equal(result, yj_transformer.first_guess)
+
+    # ensure the first guess is not returned itself
+    assert result is not yj_transformer.first_guess
+
+
+@pytest.mark.parametrize("name", ["constant", "logistic"])
+def test_yeo_johnson_optimize_lambda_np_float32(name):
+    # the optimization is done in float64 - also for float32 data
+    np.random.seed(0)
+    n_years = 100
+
+    yearly_T = np.random.randn(n_years)
+    local_monthly_residuals = sp.stats.skewnorm.rvs(2, size=n_years).astype("float32")
+
+    yj_transformer = YeoJohnsonTransformer(name)
+    result = yj_transformer._optimize_lambda_np(local_monthly_residuals, yearly_T)
+
+    residuals_float64 = local_monthly_residuals.astype("float64")
+    expected = yj_transformer._optimize_lambda_np(residuals_float64, yearly_T)
+
+    np.testing.assert_equal(result, expected)
+
+
 def test_yeo_johnson_transform_np_trivial():
     # NOTE: testing trivial transform with lambda = 1
     n_ts = 20
@@ -400,3 +461,51 @@ def test_power_transformer_xr(stack):
     )
     assert "month" in pt_coefficients.coords
     xr.testing.assert_equal(expected_month, pt_coefficients.month)
+
+
+@pytest.mark.parametrize("dtype", ["float64", "float32"])
+def test_power_transformer_dask(dtype):
+    n_years = 10
+    n_lon, n_lat = 2, 3
+
+    monthly_residuals = skewed_data_2D(
+        n_timesteps=n_years * 12, n_lat=n_lat, n_lon=n_lon
+    ).astype(dtype)
+    yearly_T = trend_data_2D(n_timesteps=n_years, n_lat=n_lat, n_lon=n_lon, scale=2)
+    yearly_T = yearly_T.astype(dtype)
+
+    monthly_residuals_dask = monthly_residuals.chunk(cells=2)
+    yearly_T_dask = yearly_T.chunk(cells=2)
+
+    yj_transformer = YeoJohnsonTransformer("logistic")
+
+    # 1 - fitting
+    pt_coefficients = yj_transformer.fit(yearly_T, monthly_residuals)
+    result = yj_transformer.fit(yearly_T_dask, monthly_residuals_dask)
+
+    assert result.chunks is not None
+    xr.testing.assert_identical(result.compute(), pt_coefficients)
+
+    # 2 - transformation
+    transformed = yj_transformer.transform(yearly_T, monthly_residuals, pt_coefficients)
+    result = yj_transformer.transform(
+        yearly_T_dask, monthly_residuals_dask, pt_coefficients
+    )
+
+    assert result.transformed.chunks is not None
+    xr.testing.assert_identical(result.compute(), transformed)
+
+    # the declared dtype of the lazy result must match the computed one
+    assert transformed.transformed.dtype == np.float64
+    assert result.transformed.dtype == np.float64
+
+    # 3 - back-transformation
+    inverse_transformed = yj_transformer.inverse_transform(
+        yearly_T, transformed.transformed, pt_coefficients
+    )
+    result = yj_transformer.inverse_transform(
+        yearly_T_dask, result.transformed, pt_coefficients
+    )
+
+    assert result.inverted.chunks is not None
+    xr.testing.assert_identical(result.compute(), inverse_transformed)